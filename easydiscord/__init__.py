@@ -2,6 +2,10 @@ __version__ = '0.1a0'
 
 from .core import *
 from .bot import *
+from .scheduler import *
+from .resilience import *
+from .replay import *
+from .help_index import *
 
 # ! Add doc for api token link to how to obtain a token
 def get_bot(token: str, *args, **kwargs):
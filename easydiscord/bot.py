@@ -1,9 +1,21 @@
 from .core import BotBase
 from .exceptions import EasyDiscordError
+from .utils import _Paginator
 from discord import TextChannel as _channel
+from discord import File as _file
+from discord import Forbidden as _forbidden
+from tempfile import SpooledTemporaryFile
+from collections.abc import Iterable
+
+import asyncio
 
 __all__ = ['Bot']
 
+# The maximum length of a Discord message's content.
+MAX_CONTENT = 2000
+# The reactions flipping through paginated replies.
+PREVIOUS, FOLLOWING = '\N{BLACK LEFT-POINTING TRIANGLE}', '\N{BLACK RIGHT-POINTING TRIANGLE}'
+
 
 class Bot(BotBase):
     """
@@ -12,10 +24,149 @@ class Bot(BotBase):
     Call :meth:`.config()` method after that bot is initiated.
     """
 
-    async def reply(self, current, reply_message):
+    async def reply(self, current, reply_message, *, paginate=False, filename=None,
+                    timeout=60.0, max_cached_pages=10):
+        """
+        |coro|
+
+        Replies to a message or a channel. ``reply_message`` can either be any value, sent as text,
+        or an iterable/async iterable of :class:`str` for large outputs
+        (:class:`str` and :class:`bytes` are sent as text). Iterables are consumed lazily
+        and split into pages of at most 2000 characters, so the first page is sent as soon as it's ready.
+        Sync iterators, such as generators and files, are read in the loop's default executor
+        so that slow sources don't block the bot.
+
+        Args:
+            current:
+                The object to reply to, anything with a ``channel`` attribute (eg. a message or a context),
+                or a :class:`TextChannel <discord.TextChannel>`.
+
+            reply_message:
+                The content of the reply, a value, an iterable or an async iterable.
+
+            paginate: (:class:`bool`):
+                If set to :const:`True`, only one message is sent and reacting with ◀ or ▶ flips through the pages.
+                Following pages are only fetched from ``reply_message`` when they are requested,
+                so it must stay usable after the command returns.
+                This coroutine returns once the first page is sent, the reactions are handled in the background.
+                Defaults to :const:`False`, which sends every page as its own message.
+
+            filename: (:class:`str`):
+                If provided, the output is sent as a single attachment with this name instead.
+                The output is spooled to a temporary file so large outputs don't stay in memory.
+
+            timeout: (:class:`float`):
+                How many seconds to wait for a reaction before pagination stops. Defaults to ``60.0``.
+
+            max_cached_pages: (:class:`int`):
+                How many already seen pages are kept to flip back to. Defaults to ``10``.
+
+        Returns:
+            The last :class:`Message <discord.Message>` sent.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``current`` cannot be replied to.
+
+        Examples: ::
+
+            def read_logs():
+                with open('bot.log') as f:
+                    yield from f
+
+            async def logs(ctx):
+                await bot.reply(ctx, read_logs(), paginate=True)
+
+            bot.add_command(logs)
+        """
+
         if hasattr(current, "channel"):
             channel = current.channel
-        elif not isinstance(current, _channel):
+        elif isinstance(current, _channel):
+            channel = current
+        else:
             raise EasyDiscordError("Cannot reply with type {}".format(type(current)))
 
-        await channel.send(content=reply_message)
+        if isinstance(reply_message, (str, bytes)) or not (isinstance(reply_message, Iterable) or
+                                                           hasattr(reply_message, '__aiter__')):
+            reply_message = str(reply_message)
+            if filename is None and len(reply_message) <= MAX_CONTENT:
+                return await channel.send(content=reply_message)
+            reply_message = [reply_message]
+
+        if filename is not None:
+            return await self._reply_file(channel, reply_message, filename)
+
+        pages = _Paginator(reply_message, limit=MAX_CONTENT)
+        if paginate:
+            return await self._reply_paginated(current, channel, pages, timeout, max_cached_pages)
+
+        message = None
+        async for page in pages:
+            message = await channel.send(content=page)
+        return message
+
+    async def _reply_file(self, channel, source, filename):
+        with SpooledTemporaryFile(max_size=1024 * 1024) as fp:
+            async for chunk in _Paginator(source, limit=MAX_CONTENT):
+                fp.write(chunk.encode())
+            fp.seek(0)
+            return await channel.send(file=_file(fp, filename=filename))
+
+    async def _reply_paginated(self, current, channel, pages, timeout, max_cached_pages):
+
+        cache = [await pages.next_page()]
+        if cache[0] is None:
+            return None
+        message = await channel.send(content=cache[0])
+
+        second = await pages.next_page()
+        if second is None:
+            return message
+        cache.append(second)
+
+        await message.add_reaction(PREVIOUS)
+        await message.add_reaction(FOLLOWING)
+        # The reactions are handled in the background so that the command returns right away.
+        asyncio.ensure_future(self._paginate(current, message, pages, cache, timeout, max_cached_pages))
+        return message
+
+    async def _paginate(self, current, message, pages, cache, timeout, max_cached_pages):
+        first = index = 0  # Page numbers of cache[0] and of the shown page.
+        author = getattr(current, "author", None)
+
+        def check(reaction, user):
+            return (reaction.message.id == message.id and user != self.bot.user and
+                    (author is None or user == author) and str(reaction.emoji) in {PREVIOUS, FOLLOWING})
+
+        while True:
+            try:
+                reaction, user = await self.bot.wait_for('reaction_add', check=check, timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+
+            shown = index
+            if str(reaction.emoji) == FOLLOWING:
+                if index - first + 1 >= len(cache):
+                    page = await pages.next_page()
+                    if page is not None:
+                        cache.append(page)
+                        if len(cache) > max(max_cached_pages, 2):
+                            cache.pop(0)
+                            first += 1
+                if index - first + 1 < len(cache):
+                    index += 1
+            elif index > first:
+                index -= 1
+
+            if index != shown:
+                await message.edit(content=cache[index - first])
+            try:
+                await message.remove_reaction(reaction.emoji, user)
+            except _forbidden:
+                pass
+
+        try:
+            await message.clear_reactions()
+        except _forbidden:
+            pass
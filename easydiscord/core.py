@@ -1,6 +1,9 @@
 from discord.ext import commands as _cmd
 from .exceptions import *
-from .utils import _no_print, _check_coro
+from .utils import _check_coro, _Paginator
+from .scheduler import Scheduler
+from .replay import Recorder
+from .help_index import HelpIndex
 from functools import wraps
 
 import abc
@@ -42,6 +45,7 @@ class Group(abc.ABC):
                 When :meth:`register` is not overwritten by subclasses.
         """
         self.func_names = {}
+        self.func_priorities = {}
 
     # ! make set_name support decorators
     def set_name(self, meth, name):
@@ -81,6 +85,41 @@ class Group(abc.ABC):
             self.func_names[meth.__func__.__name__] = name
         return meth
 
+    def set_priority(self, meth, priority):
+        """
+        Sets the priority of a command from this group, overriding the ``priority`` passed to :meth:`.add_group`.
+        Only use :meth:`set_priority` in :meth:`register`.
+
+        Args:
+            meth: (:class:`method`):
+                The method whom priority will be changed.
+
+            priority: (:class:`str`):
+                One of ``'interactive'``, ``'normal'`` or ``'background'``.
+
+        Returns:
+            The method provided by argument ``meth``.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``priority`` is not a valid priority.
+
+        Examples: ::
+
+            class Stats(easydiscord.Group):
+                @property
+                def register(self):
+                    self.set_priority(self.rebuild, 'background')
+                    return [self.show, self.rebuild]
+        """
+
+        Scheduler.check_priority(priority)
+        if not hasattr(meth, '__self__'):
+            self.func_priorities[meth.__name__] = priority
+        else:
+            self.func_priorities[meth.__func__.__name__] = priority
+        return meth
+
     @property
     @abc.abstractmethod
     def register(self):
@@ -99,7 +138,7 @@ class Group(abc.ABC):
 class BotBase:
 
     # ! add 'ignore' from severity
-    def __init__(self, token, *, verbose: bool=True, severity='high'):
+    def __init__(self, token, *, verbose: bool=True, severity='high', max_concurrency=None):
         """
         Args:
             token: (:class:`str`):
@@ -113,6 +152,11 @@ class BotBase:
                 If set to 'low', a warning will be raised; if set to 'high' an exception would be raised.
                 Defaults to 'high'.
 
+            max_concurrency: (:class:`int`):
+                How many command and event handlers may run at the same time,
+                the rest waits according to their priority. A handler keeps its slot while it awaits,
+                see :class:`.Scheduler`. Defaults to :const:`None`, unlimited.
+
         Raises:
             :class:`AttributeError`:
                 When severity is incorrectly set.
@@ -129,6 +173,8 @@ class BotBase:
         if severity not in {'high', 'low'}:
             raise AttributeError("severity must be set to 'high' or 'low'")
         self.severity = severity
+        self.scheduler = Scheduler(max_concurrency)
+        self.help_index = HelpIndex()
 
     @property
     def bot(self) -> _cmd.Bot:
@@ -177,8 +223,7 @@ class BotBase:
     def prefix(self, val):
         self._prefix = val
 
-    # ! help_format
-    def config(self, prefix="$", default_on_ready=True, desc="", help_format=None):
+    def config(self, prefix="$", default_on_ready=True, desc="", help_format=None, suggest=True):
         """
         Configures this :class:`Bot`.
 
@@ -192,16 +237,37 @@ class BotBase:
             desc: (:class:`str`):
                 The description for the :class:`Bot`.
 
-            help_format:
-                |no-impl|
+            help_format: (:class:`str`):
+                The format of each command's line in the ``help`` command's pages.
+                See :class:`.HelpIndex` for the available fields.
+
+            suggest: (:class:`bool`):
+                Whether or not to reply with the closest commands when an unknown command is used.
+                Defaults to :const:`True`.
 
         Returns:
             :class:`Bot`:
                 The :class:`Bot` itself.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``help_format`` uses an unknown field or is malformed.
         """
 
         self.prefix = prefix if self._prefix is None else prefix
-        self.bot = _cmd.Bot(command_prefix=self.prefix, description=desc, formatter=help_format)
+        self.bot = _cmd.Bot(command_prefix=self.prefix, description=desc)
+        if help_format is not None:
+            self.help_index.line_format = help_format
+        self.help_index.description = desc
+
+        self.bot.remove_command('help')
+        help_command = _cmd.command(name='help', cls=Command, help='Shows this message.')
+        help_command = help_command(self.scheduler.wrap(self.help, 'interactive'))
+        self.bot.add_command(help_command)
+        self._index_command(help_command)
+
+        if suggest:
+            self.bot.on_command_error = self._suggest_wrapper(self.bot.on_command_error)
         if default_on_ready:
             self.add_event(self.on_ready)
         return self
@@ -254,6 +320,72 @@ class BotBase:
 
         await self.bot.process_commands(message)
 
+    def record(self, path):
+        """
+        Starts recording the messages and command invocations this :class:`Bot` receives,
+        so they can be replayed later with :class:`.Replayer`.
+        The recording is appended to ``path``, one JSON object per line.
+
+        Args:
+            path: (:class:`str`):
+                The file to append the recording to.
+
+        Returns:
+            :class:`.Recorder`:
+                The recorder, call :meth:`Recorder.close` to stop recording.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When :meth:`Bot.config()` is not called first.
+
+        Examples: ::
+
+            bot.record('traffic.jsonl')
+            bot.start_bot()
+        """
+
+        recorder = Recorder(path).attach(self)
+        self.print("Recording to {}".format(path))
+        return recorder
+
+    async def help(self, ctx, *, name=None):
+        """
+        |coro|
+
+        The ``help`` command. Shows the overview of all the commands, or the help of a group or of a command.
+        The pages come from :attr:`help_index`, they are only rendered again after a command is added.
+        """
+
+        if name is None:
+            page = self.help_index.page(prefix=self.prefix)
+        elif name in self.help_index.groups:
+            page = self.help_index.page(name, prefix=self.prefix)
+        elif name in self.help_index:
+            page = self.help_index.describe(name, prefix=self.prefix)
+        else:
+            page = 'No command called "{}" found.'.format(name)
+            suggestions = self.help_index.suggest(name)
+            if suggestions:
+                page += ' Did you mean {}?'.format(', '.join(self.prefix + s for s in suggestions))
+
+        async for chunk in _Paginator([page]):
+            await ctx.send(chunk)
+
+    def _suggest_wrapper(self, on_command_error):
+
+        async def suggest_on_command_error(ctx, error):
+            if isinstance(error, _cmd.CommandNotFound) and ctx.invoked_with:
+                suggestions = self.help_index.suggest(ctx.invoked_with)
+                if suggestions:
+                    await ctx.send('Unknown command "{}{}". Did you mean {}?'.format(
+                        self.prefix, ctx.invoked_with, ', '.join(self.prefix + s for s in suggestions)))
+                    return
+            await on_command_error(ctx, error)
+        return suggest_on_command_error
+
+    def _index_command(self, command):
+        self.help_index.add_command(command.name, command.cog_name, command.help, command.signature)
+
     def reload(self):
         """
         Resets the bot. Shuts the bot down and restarts it.
@@ -289,7 +421,7 @@ class BotBase:
         return on_message
 
     # ! more desc
-    def add_event(self, func, *, name=None):
+    def add_event(self, func, *, name=None, priority='normal'):
         """
         Adds an event handler. The ``name`` keyword argument can be used to override the function's name.
 
@@ -301,21 +433,38 @@ class BotBase:
                 The optional replacement name for your event handler.
                 If :const:`None` is passed, the function name will be used.
 
+            priority: (:class:`str`):
+                ``'interactive'``, ``'normal'`` or ``'background'``. When the event loop lags behind,
+                ``'background'`` handlers are deferred first (and the oldest dropped if too many wait),
+                ``'normal'`` ones only when it lags much further and ``'interactive'`` ones never,
+                see :class:`.Scheduler`.
+                Defaults to ``'normal'``.
+
         Returns:
             The function provided by argument ``func``.
 
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``priority`` is not a valid priority.
+
         Examples: ::
 
             def on_message(message):
                 print('hi')
 
             bot.add_event(on_message)
+
+            async def on_member_update(before, after):
+                print(after.activity)
+
+            bot.add_event(on_member_update, priority='background')
         """
 
         if name is None:
             name = func.__name__
 
         func = _check_coro(func, self.severity)
+        func = self.scheduler.wrap(func, priority)
 
         if name == 'on_message':
             func = self._on_message_wrapper(func)
@@ -325,7 +474,7 @@ class BotBase:
         return func
 
     # ! more info
-    def add_command(self, func, *, name=None):
+    def add_command(self, func, *, name=None, priority='interactive'):
         """
         Adds a handler to a command. The ``name`` keyword argument can be used to override the function name.
 
@@ -337,9 +486,18 @@ class BotBase:
                 The optional replacement name for your command.
                 If :const:`None` is passed, the function name will be used.
 
+            priority: (:class:`str`):
+                ``'interactive'``, ``'normal'`` or ``'background'``. See :meth:`add_event`,
+                commands are best left ``'interactive'`` so that they are never deferred.
+                Defaults to ``'interactive'``.
+
         Returns:
             The function provided by argument ``func``.
 
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``priority`` is not a valid priority.
+
         Examples: ::
 
             def hi(ctx):
@@ -348,17 +506,25 @@ class BotBase:
             bot.add_command(hi)
         """
 
+        command = self._add_command(func, name, priority)
+        self.print("Command {} is registered".format(command.name))
+        return command
+
+    def _add_command(self, func, name, priority, cog_name=None):
         func = _check_coro(func, self.severity)
+        func = self.scheduler.wrap(func, priority)
 
         name = func.__name__ if name is None else name
         command = _cmd.command(name=name, cls=Command)(func)
+        if cog_name is not None:
+            command.cog_name = cog_name
         self.all_commands[name] = command
 
         self.bot.add_command(command)
-        self.print("Command {} is registered".format(name))
+        self._index_command(command)
         return command
 
-    def add_group(self, group: Group, *, name=None):
+    def add_group(self, group: Group, *, name=None, priority='interactive'):
         """
         Adds a group of commands. The ``name`` keyword argument can be used to override the class name.
 
@@ -370,6 +536,11 @@ class BotBase:
                 The optional replacement name for your group.
                 If :const:`None` is passed, the class name will be used.
 
+            priority: (:class:`str`):
+                The priority of the group's commands, see :meth:`add_command`.
+                It can be overridden per command with :meth:`Group.set_priority`.
+                Defaults to ``'interactive'``.
+
         Returns:
             The class provided by argument ``group``.
 
@@ -393,17 +564,16 @@ class BotBase:
             raise EasyDiscordError("group argument must be a subclass of easydiscord.Group.")
 
         group_name = type(group).__name__ if name is None else name
+        self.help_index.set_group_doc(group_name, type(group).__doc__)
 
         for func in group.register:
             if not hasattr(func, '__self__'):
                 raise AttributeError("Command to register must be an instance's method, maybe try self.{}?".format(
                     func.__name__))
             command_name = func.__self__.func_names.get(func.__func__.__name__, func.__func__.__name__)
+            command_priority = func.__self__.func_priorities.get(func.__func__.__name__, priority)
 
-            with _no_print(self):
-                command = self.add_command(func, name=command_name)
-                setattr(command, 'cog_name', group_name)
-
+            command = self._add_command(func, command_name, command_priority, cog_name=group_name)
             self.print("Command {} of {} is registered".format(command.name, group_name))
 
         return group
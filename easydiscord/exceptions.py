@@ -1,7 +1,7 @@
 import warnings
 import inspect
 
-__all__ = ["EasyDiscordError", "EasyDiscordWarning"]
+__all__ = ["EasyDiscordError", "EasyDiscordWarning", "CircuitOpenError"]
 
 
 # ! add more exceptions
@@ -17,6 +17,12 @@ class EasyDiscordError(Exception):
                   "Don't forget to `await` asynchronous functions/")
 
 
+class CircuitOpenError(EasyDiscordError):
+    """
+    Raised by a :class:`.CircuitBreaker` instead of calling its function while the circuit is open.
+    """
+
+
 class EasyDiscordWarning(UserWarning):
     """
         This is an overall warning that all easydiscord functions raises when encountered a minor problem.
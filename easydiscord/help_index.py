@@ -0,0 +1,247 @@
+from .exceptions import EasyDiscordError
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+__all__ = ["HelpIndex"]
+
+# Commands without a group are listed under this heading.
+NO_GROUP = 'No Category'
+
+
+def _ngrams(word, n=2):
+    word = ' {} '.format(word.lower())
+    return {word[i:i + n] for i in range(max(1, len(word) - n + 1))}
+
+
+class HelpIndex:
+
+    def __init__(self, line_format=None, description=''):
+        """
+        Keeps the help of every registered command ready to be sent.
+        The index is updated as commands are added, rendered pages are cached per group
+        and only re-rendered after a command of that group changes.
+        Misspelled command names are looked up with a prebuilt bigram index, so only the commands
+        sharing enough of the name are compared.
+
+        Args:
+            line_format: (:class:`str`):
+                The format of each command's line in the help pages.
+                The available fields are ``prefix``, ``name``, ``short``, ``group`` and ``width``
+                (the length of the longest command name of the group).
+                Defaults to ``'  {prefix}{name:<{width}}  {short}'``.
+
+            description: (:class:`str`):
+                Shown on top of the overview page.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``line_format`` uses an unknown field or is malformed.
+        """
+        self._pages = {}
+        self.line_format = line_format or '  {prefix}{name:<{width}}  {short}'
+        self.description = description
+        self._commands = {}
+        self._groups = OrderedDict()
+        self._group_docs = {}
+        self._ngrams = {}
+        self._gram_counts = {}
+
+    @property
+    def line_format(self) -> str:
+        """
+        The format of each command's line, setting it clears the cached pages.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When set to a format using an unknown field or malformed.
+        """
+        return self._line_format
+
+    @line_format.setter
+    def line_format(self, val):
+        try:
+            val.format(prefix='', name='', short='', group='', width=1)
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError) as e:
+            raise EasyDiscordError("Invalid help format {!r}: {!r}".format(val, e)) from e
+        self._line_format = val
+        self._pages.clear()
+
+    @property
+    def description(self) -> str:
+        """
+        Shown on top of the overview page, setting it clears the cached pages.
+        """
+        return self._description
+
+    @description.setter
+    def description(self, val):
+        self._description = val
+        self._pages.clear()
+
+    def __contains__(self, name):
+        return name in self._commands
+
+    @property
+    def groups(self):
+        """
+        The names of the groups that have commands, :const:`None` being the commands without a group.
+        """
+        return list(self._groups)
+
+    def _invalidate(self, group):
+        for key in [key for key in self._pages if key[0] in {group, None}]:
+            del self._pages[key]
+
+    def add_command(self, name, group=None, doc=None, signature=''):
+        """
+        Adds or updates a command in the index.
+
+        Args:
+            name: (:class:`str`):
+                The name of the command.
+
+            group: (:class:`str`):
+                The name of the group of the command, :const:`None` if it has no group.
+
+            doc: (:class:`str`):
+                The help of the command, its first line is used in the group's page.
+
+            signature: (:class:`str`):
+                The arguments of the command, shown in the command's own page.
+        """
+        if name in self._commands:
+            self.remove_command(name)
+
+        doc = (doc or '').strip()
+        self._commands[name] = (group, doc, signature)
+        self._groups.setdefault(group, []).append(name)
+        grams = _ngrams(name)
+        self._gram_counts[name] = len(grams)
+        for gram in grams:
+            self._ngrams.setdefault(gram, set()).add(name)
+        self._invalidate(group)
+
+    def remove_command(self, name):
+        """
+        Removes a command from the index, nothing happens if it isn't in the index.
+        """
+        if name not in self._commands:
+            return
+        group = self._commands.pop(name)[0]
+        self._groups[group].remove(name)
+        if not self._groups[group]:
+            del self._groups[group]
+        del self._gram_counts[name]
+        for gram in _ngrams(name):
+            self._ngrams[gram].discard(name)
+        self._invalidate(group)
+
+    def set_group_doc(self, group, doc):
+        """
+        Sets the description shown on top of a group's page.
+        """
+        self._group_docs[group] = (doc or '').strip()
+        self._invalidate(group)
+
+    def _render_lines(self, group, prefix):
+        names = sorted(self._groups.get(group, []))
+        width = max(map(len, names), default=0)
+        for name in names:
+            doc = self._commands[name][1]
+            yield self.line_format.format(prefix=prefix, name=name, short=doc.split('\n', 1)[0],
+                                          group=group, width=width).rstrip()
+
+    def _render(self, group, prefix):
+        if group is not None:
+            lines = ['{}:'.format(group)]
+            if self._group_docs.get(group):
+                lines.append(self._group_docs[group])
+            lines.append('')
+            lines.extend(self._render_lines(group, prefix))
+            return '\n'.join(lines)
+
+        lines = [self.description, ''] if self.description else []
+        for name in sorted(self._groups, key=lambda g: (g is None, g or '')):
+            lines.append('{}:'.format(NO_GROUP if name is None else name))
+            lines.extend(self._render_lines(name, prefix))
+            lines.append('')
+        lines.append('Type {}help <command> for more info on a command.'.format(prefix))
+        lines.append('You can also type {}help <group> for more info on a group.'.format(prefix))
+        return '\n'.join(lines)
+
+    def page(self, group=None, prefix=''):
+        """
+        Returns the help page of a group, or the overview of all the commands if ``group`` is :const:`None`.
+
+        Args:
+            group: (:class:`str`):
+                The name of the group.
+
+            prefix: (:class:`str`):
+                The prefix shown before command names.
+
+        Returns:
+            :class:`str`
+        """
+        key = (group, prefix)
+        if key not in self._pages:
+            self._pages[key] = self._render(group, prefix)
+        return self._pages[key]
+
+    def describe(self, name, prefix=''):
+        """
+        Returns the help page of a single command.
+
+        Returns:
+            :class:`str`
+
+        Raises:
+            :class:`KeyError`:
+                When the command isn't in the index.
+        """
+        group, doc, signature = self._commands[name]
+        usage = '{}{} {}'.format(prefix, name, signature).strip()
+        return '{}\n\n{}'.format(usage, doc) if doc else usage
+
+    def suggest(self, name, limit=3, cutoff=0.6, gram_cutoff=0.3):
+        """
+        Finds the registered commands with a name close to ``name``.
+
+        Args:
+            name: (:class:`str`):
+                The misspelled command name.
+
+            limit: (:class:`int`):
+                The maximum amount of suggestions. Defaults to ``3``.
+
+            cutoff: (:class:`float`):
+                The minimum similarity, between ``0`` and ``1``, of a suggestion. Defaults to ``0.6``.
+
+            gram_cutoff: (:class:`float`):
+                The minimum portion of shared bigrams (Dice coefficient) for a command to be compared at all.
+                Names of 4 characters or less share too few bigrams when misspelled, so it isn't applied to them.
+                Defaults to ``0.3``.
+
+        Returns:
+            :class:`list`:
+                The names of the closest commands, the closest first.
+        """
+        grams = _ngrams(name)
+        if len(name) <= 4:
+            gram_cutoff = 0.0
+        shared = {}
+        for gram in grams:
+            for candidate in self._ngrams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        matcher = SequenceMatcher(b=name.lower())
+        scores = []
+        for candidate, count in shared.items():
+            if 2 * count / (len(grams) + self._gram_counts[candidate]) < gram_cutoff:
+                continue
+            matcher.set_seq1(candidate.lower())
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scores.append((-score, candidate))
+        return [candidate for _, candidate in sorted(scores)[:limit]]
@@ -0,0 +1,451 @@
+from discord.ext import commands as _cmd
+from .exceptions import EasyDiscordError
+from collections import OrderedDict
+
+import asyncio
+import json
+import time
+
+__all__ = ["Recorder", "Replayer", "ReplayReport"]
+
+
+class Recorder:
+
+    def __init__(self, path):
+        """
+        Records the messages and command invocations seen by a :class:`Bot` into an append-only file,
+        one compact JSON object per line. Use :meth:`Bot.record` rather than creating one directly.
+
+        Args:
+            path: (:class:`str`):
+                The file to append the recording to.
+        """
+        self.path = path
+        self._file = None
+        self._invoked = OrderedDict()
+
+    def attach(self, bot):
+        """
+        Starts recording the events of ``bot``.
+
+        Args:
+            bot: (:class:`Bot`):
+                The configured bot to record.
+
+        Returns:
+            The :class:`Recorder` itself.
+        """
+        self._file = open(self.path, 'a', buffering=1)
+        bot.bot.add_listener(self.on_message, 'on_message')
+        bot.bot.add_listener(self.on_command, 'on_command')
+        bot.bot.add_listener(self.on_command_completion, 'on_command_completion')
+        return self
+
+    def close(self):
+        """
+        Stops writing to the file, events received afterwards are ignored.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, event):
+        if self._file is not None:
+            self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+
+    async def on_message(self, message):
+        self._write({
+            't': time.time(), 'e': 'message', 'id': message.id, 'c': message.content,
+            'a': message.author.id, 'n': message.author.name, 'b': message.author.bot,
+            'ch': message.channel.id, 'g': message.guild.id if message.guild is not None else None,
+        })
+
+    async def on_command(self, ctx):
+        self._invoked[ctx.message.id] = time.monotonic()
+        # Commands that fail never complete, don't keep their start time forever.
+        while len(self._invoked) > 1000:
+            self._invoked.popitem(last=False)
+
+    async def on_command_completion(self, ctx):
+        started = self._invoked.pop(ctx.message.id, None)
+        if started is not None:
+            self._write({'t': time.time(), 'e': 'command', 'id': ctx.message.id,
+                         'cmd': ctx.command.qualified_name, 'l': time.monotonic() - started})
+
+
+class ReplayReport:
+
+    def __init__(self, speed=None):
+        """
+        The throughput and latencies of a replay (or of a recording, see :meth:`Replayer.recorded_report`).
+        Reports can be saved with :meth:`save` and loaded with :meth:`load`,
+        so runs of different versions of a bot can be compared.
+
+        Args:
+            speed: (:class:`float`):
+                The speed of the replay, :const:`None` if it wasn't paced.
+        """
+        self.speed = speed
+        self.messages = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.latencies = {}
+        self.message_latencies = []
+        self.schedule_lags = []
+
+    def add(self, command, latency):
+        self.latencies.setdefault(command, []).append(latency)
+
+    @property
+    def commands(self) -> int:
+        """
+        How many commands were invoked.
+        """
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        """
+        Commands invoked per second. In a paced replay this mostly follows the recording,
+        see ``behind_p95`` and ``behind_max`` in :meth:`summary` for whether the bot kept up.
+        """
+        if not self.duration:
+            return 0.0
+        return self.commands / self.duration
+
+    @staticmethod
+    def _percentile(latencies, percent):
+        if not latencies:
+            return 0.0
+        latencies = sorted(latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+    def percentile(self, percent, command=None) -> float:
+        """
+        Returns the given percentile of the latencies in seconds, of all commands or of ``command`` only.
+        """
+        if command is None:
+            return self._percentile([latency for values in self.latencies.values() for latency in values], percent)
+        return self._percentile(self.latencies.get(command, []), percent)
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            :class:`dict`:
+                The main metrics of this report, latencies are in seconds.
+                ``message_p50`` and ``message_p95`` are the time taken by all the ``on_message`` handlers
+                of each message, including the commands it invoked.
+                ``behind_p95`` and ``behind_max`` are how late messages were fed compared to the recording's
+                schedule, because the bot fell behind. They are ``0`` for unpaced replays.
+        """
+        return OrderedDict([
+            ('messages', self.messages), ('commands', self.commands), ('errors', self.errors),
+            ('throughput', self.throughput), ('p50', self.percentile(50)),
+            ('p95', self.percentile(95)), ('max', self.percentile(100)),
+            ('message_p50', self._percentile(self.message_latencies, 50)),
+            ('message_p95', self._percentile(self.message_latencies, 95)),
+            ('behind_p95', self._percentile(self.schedule_lags, 95)),
+            ('behind_max', self._percentile(self.schedule_lags, 100)),
+        ])
+
+    def compare(self, other) -> dict:
+        """
+        Compares this report with an earlier one.
+
+        Args:
+            other: (:class:`ReplayReport`):
+                The report to compare with, usually the baseline.
+
+        Returns:
+            :class:`dict`:
+                Maps each metric of :meth:`summary` to a ``(other, self, difference)`` tuple.
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When the reports were made at different speeds, their metrics aren't comparable.
+        """
+        if self.speed != other.speed:
+            raise EasyDiscordError("Cannot compare reports made at different speeds ({} and {}).".format(
+                other.speed, self.speed))
+        theirs = other.summary()
+        return OrderedDict((metric, (theirs[metric], value, value - theirs[metric]))
+                           for metric, value in self.summary().items())
+
+    def save(self, path):
+        """
+        Saves this report as JSON.
+
+        Args:
+            path: (:class:`str`):
+                The file to write to.
+        """
+        with open(path, 'w') as f:
+            json.dump({'speed': self.speed, 'messages': self.messages, 'errors': self.errors,
+                       'duration': self.duration, 'latencies': self.latencies,
+                       'message_latencies': self.message_latencies, 'schedule_lags': self.schedule_lags}, f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a report saved by :meth:`save`.
+
+        Args:
+            path: (:class:`str`):
+                The file to read from.
+
+        Returns:
+            :class:`ReplayReport`
+        """
+        with open(path) as f:
+            data = json.load(f)
+        report = cls(data['speed'])
+        report.messages = data['messages']
+        report.errors = data['errors']
+        report.duration = data['duration']
+        report.latencies = data['latencies']
+        report.message_latencies = data['message_latencies']
+        report.schedule_lags = data.get('schedule_lags', [])
+        return report
+
+    def __str__(self):
+        return '\n'.join('{:<12} {:.4g}'.format(metric, value) for metric, value in self.summary().items())
+
+
+class _ReplayUser:
+
+    def __init__(self, id, name, bot=False):
+        self.id = id
+        self.name = self.display_name = name
+        self.bot = bot
+        self.mention = '<@{}>'.format(id)
+
+    def __eq__(self, other):
+        return getattr(other, 'id', None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class _SentMessage:
+
+    def __init__(self, channel, content):
+        self.channel = channel
+        self.content = content
+        self.id = None
+
+    async def _noop(self, *args, **kwargs):
+        pass
+
+    edit = delete = add_reaction = remove_reaction = clear_reactions = _noop
+
+
+class _ReplayGuild:
+
+    def __init__(self, id, me):
+        self.id = id
+        self.name = str(id)
+        self.me = me
+        self.members = []
+        self.channels = []
+
+    def get_member(self, id):
+        return None
+
+
+class _ReplayChannel:
+
+    def __init__(self, id, guild):
+        self.id = id
+        self.guild = guild
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        self.sent += 1
+        return _SentMessage(self, content)
+
+
+class _ReplayMessage:
+
+    def __init__(self, event, channel):
+        self.id = event['id']
+        self.content = event['c']
+        self.author = _ReplayUser(event['a'], event['n'], event['b'])
+        self.channel = channel
+        self.guild = channel.guild
+        self.mentions = []
+        self.attachments = []
+
+
+class _ReplayContext(_cmd.Context):
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class Replayer:
+
+    def __init__(self, path):
+        """
+        Feeds a recording made by :meth:`Bot.record` back into a :class:`Bot` without connecting to Discord.
+        Replies are sent to local stand-in channels instead, so only the bot's own processing is measured.
+        Guild messages are replayed in stand-in guilds with the recorded ids, they have no members or roles,
+        so commands looking those up may fail.
+
+        Args:
+            path: (:class:`str`):
+                The recording to replay.
+
+        Examples: ::
+
+            bot = easydiscord.get_bot("MY_API_TOKEN").config()
+            bot.add_command(search)
+
+            replayer = easydiscord.Replayer('traffic.jsonl')
+            loop = asyncio.get_event_loop()
+            report = loop.run_until_complete(replayer.replay(bot, speed=10))
+
+            # Run once before a change and save the report, then compare with a run after it.
+            report.save('before.json')
+            print(report.compare(easydiscord.ReplayReport.load('before.json')))
+        """
+        self.path = path
+
+    def events(self, kind=None):
+        """
+        Lazily reads the recorded events.
+
+        Args:
+            kind: (:class:`str`):
+                Only yield the ``'message'`` or ``'command'`` events. Defaults to yielding both.
+        """
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    event = json.loads(line)
+                    if kind is None or event['e'] == kind:
+                        yield event
+
+    def recorded_report(self):
+        """
+        Builds a :class:`ReplayReport` from the command latencies captured while recording.
+        These include the time spent sending replies to Discord, so they shouldn't be compared
+        with replays, whose replies go to stand-in channels. Compare replays with each other instead.
+
+        Returns:
+            :class:`ReplayReport`
+        """
+        report = ReplayReport(1.0)
+        first = last = None
+        for event in self.events():
+            first = event['t'] if first is None else first
+            last = event['t']
+            if event['e'] == 'message':
+                report.messages += 1
+            else:
+                report.add(event['cmd'], event['l'])
+        if first is not None:
+            report.duration = last - first
+        return report
+
+    async def _feed(self, bot, event, scheduled, channels, guilds, report):
+        if scheduled is not None:
+            report.schedule_lags.append(max(0.0, asyncio.get_event_loop().time() - scheduled))
+
+        channel = channels.get(event['ch'])
+        if channel is None:
+            guild = None
+            if event['g'] is not None:
+                guild = guilds.get(event['g'])
+                if guild is None:
+                    guild = guilds[event['g']] = _ReplayGuild(event['g'], bot.bot.user)
+            channel = channels[event['ch']] = _ReplayChannel(event['ch'], guild)
+        message = _ReplayMessage(event, channel)
+        report.messages += 1
+
+        # Same handlers as bot.dispatch('message', message), awaited so that they can be timed.
+        handlers = list(bot.bot.extra_events.get('on_message', [])) + [bot.bot.on_message]
+        started = time.monotonic()
+        results = await asyncio.gather(*[handler(message) for handler in handlers], return_exceptions=True)
+        report.message_latencies.append(time.monotonic() - started)
+        report.errors += sum(isinstance(result, Exception) for result in results)
+
+    async def replay(self, bot, *, speed=1.0):
+        """
+        |coro|
+
+        Replays the recorded messages into ``bot``, keeping their original spacing divided by ``speed``.
+        Every message goes through the bot's ``on_message`` handlers, including the ones added with
+        :meth:`Bot.add_event` and the command processing. Replies go to local stand-in channels.
+
+        Args:
+            bot: (:class:`Bot`):
+                A configured bot, it doesn't need to be started.
+
+            speed: (:class:`float`):
+                How much faster than recorded to replay. If set to :const:`None` or ``0``,
+                every message is fed as soon as possible. Defaults to ``1.0``.
+
+        Returns:
+            :class:`ReplayReport`
+
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``speed`` is negative.
+        """
+        if speed is not None and speed < 0:
+            raise EasyDiscordError("speed must be positive, not {}".format(speed))
+        speed = speed or None
+
+        loop = asyncio.get_event_loop()
+        report, channels, guilds, pending, invoked = ReplayReport(speed), {}, {}, set(), {}
+
+        async def on_command(ctx):
+            invoked[ctx.message.id] = time.monotonic()
+
+        async def on_command_completion(ctx):
+            started = invoked.pop(ctx.message.id, None)
+            if started is not None:
+                report.add(ctx.command.qualified_name, time.monotonic() - started)
+
+        connection = bot.bot._connection
+        real_user = connection.user
+        if real_user is None:
+            # discord.py compares authors against the bot's own user, which only exists once logged in.
+            connection.user = _ReplayUser(0, 'easydiscord-replay', True)
+        real_get_context = bot.bot.get_context
+
+        def get_context(message, *, cls=_ReplayContext):
+            return real_get_context(message, cls=cls)
+
+        # Commands processed by discord.py use this, so that their replies go to the stand-in channels too.
+        bot.bot.get_context = get_context
+        bot.bot.add_listener(on_command, 'on_command')
+        bot.bot.add_listener(on_command_completion, 'on_command_completion')
+
+        first = None
+        started = loop.time()
+        try:
+            for event in self.events('message'):
+                first = event['t'] if first is None else first
+                scheduled = None
+                if speed is not None:
+                    scheduled = started + (event['t'] - first) / speed
+                    if scheduled > loop.time():
+                        await asyncio.sleep(scheduled - loop.time())
+                task = asyncio.ensure_future(self._feed(bot, event, scheduled, channels, guilds, report))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            # Let the dispatched on_command_completion events run.
+            await asyncio.sleep(0)
+        finally:
+            connection.user = real_user
+            bot.bot.get_context = real_get_context
+            bot.bot.remove_listener(on_command, 'on_command')
+            bot.bot.remove_listener(on_command_completion, 'on_command_completion')
+
+        # Commands that never completed have failed.
+        report.errors += len(invoked)
+        report.duration = loop.time() - started
+        return report
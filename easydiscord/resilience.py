@@ -0,0 +1,245 @@
+from discord.ext import commands as _cmd
+from .core import Group
+from .exceptions import EasyDiscordError, CircuitOpenError
+from functools import wraps
+
+import asyncio
+import time
+
+__all__ = ["single_flight", "CircuitBreaker"]
+
+
+def _find_context(args):
+    for arg in args:
+        if isinstance(arg, _cmd.Context):
+            return arg
+    return None
+
+
+def _default_key(func, args, kwargs):
+    args = tuple(arg for arg in args if not isinstance(arg, _cmd.Context))
+    if not kwargs and all(isinstance(arg, Group) for arg in args):
+        # Only the caller would tell the calls apart, their results may depend on it.
+        raise EasyDiscordError("single_flight cannot tell the calls of {} apart, pass a key function.".format(
+            func.__name__))
+    return args, tuple(sorted(kwargs.items(), key=lambda item: item[0]))
+
+
+def single_flight(func=None, *, key=None, reply=False):
+    """
+    Coalesces concurrent identical calls of a coroutine function into one in-flight call,
+    every caller receives the result (or the exception) of that call.
+
+    Args:
+        func:
+            The coroutine function to wrap.
+
+        key: (:class:`function`):
+            Called with the same arguments as ``func``, returns a hashable value that identifies identical calls.
+            Defaults to all the arguments, except for the :class:`Context <discord.ext.commands.Context>`,
+            so calls from different users are coalesced. It is required when no other argument is left
+            (eg. ``balance(ctx)``), as the result likely depends on the caller.
+
+        reply: (:class:`bool`):
+            Whether or not to send a :class:`str` result with the call's
+            :class:`Context <discord.ext.commands.Context>`, instead of returning it.
+            Set it on commands that return their reply, so that every coalesced invocation replies.
+            Defaults to :const:`False`.
+
+    Returns:
+        The wrapped coroutine function.
+
+    Raises:
+        :class:`.EasyDiscordError`:
+            When called without a ``key`` and without any argument other than the context.
+
+    Examples: ::
+
+        @easydiscord.single_flight(reply=True)
+        async def weather(ctx, city):
+            return await fetch_weather(city)
+
+        bot.add_command(weather)
+
+        @easydiscord.single_flight(key=lambda ctx: ctx.author.id)
+        async def fetch_balance(ctx):
+            ...
+    """
+
+    if func is None:
+        return lambda f: single_flight(f, key=key, reply=reply)
+
+    in_flight = {}
+
+    @wraps(func)
+    async def coalesced(*args, **kwargs):
+        call_key = key(*args, **kwargs) if key is not None else _default_key(func, args, kwargs)
+        try:
+            hash(call_key)
+        except TypeError:  # Unhashable arguments are never coalesced.
+            future = asyncio.ensure_future(func(*args, **kwargs))
+        else:
+            future = in_flight.get(call_key)
+            if future is None:
+                future = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[call_key] = future
+                future.add_done_callback(lambda _: in_flight.pop(call_key, None))
+
+        # A cancelled caller must not cancel the call the other callers are waiting on.
+        result = await asyncio.shield(future)
+        ctx = _find_context(args) if reply else None
+        if ctx is not None and isinstance(result, str):
+            await ctx.send(result)
+            return None
+        return result
+    return coalesced
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, *, timeout=None,
+                 failure_message="This command is temporarily unavailable, please try again later.",
+                 exceptions=(Exception,)):
+        """
+        Stops calling a failing backend for a while, so that the calls fail fast instead of piling up.
+        After ``failure_threshold`` consecutive failures the circuit opens and every call raises
+        :class:`.CircuitOpenError` immediately. After ``reset_timeout`` seconds, one trial call is let through;
+        the circuit closes again if it succeeds and re-opens if it fails.
+        Calls that were already running when the circuit changed state don't affect it when they finish.
+
+        An instance is used as a decorator, on commands or on any coroutine function they await.
+        One instance can be shared by all the commands calling the same backend.
+
+        Args:
+            failure_threshold: (:class:`int`):
+                How many consecutive failures open the circuit. Defaults to ``5``.
+
+            reset_timeout: (:class:`float`):
+                How many seconds the circuit stays open. Defaults to ``30.0``.
+
+            timeout: (:class:`float`):
+                If provided, calls taking longer than this many seconds are cancelled and count as failures.
+
+            failure_message: (:class:`str`):
+                What commands reply with while the circuit is open. If set to :const:`None`,
+                :class:`.CircuitOpenError` is raised instead.
+
+            exceptions: (:class:`tuple`):
+                The exception types that count as failures. Defaults to ``(Exception,)``.
+
+        Examples: ::
+
+            search_backend = easydiscord.CircuitBreaker(timeout=5)
+
+            class Search(easydiscord.Group):
+                @property
+                def register(self):
+                    return [self.search, self.lookup]
+
+                @search_backend
+                async def search(self, ctx, query):
+                    ...
+
+                @search_backend
+                async def lookup(self, ctx, item_id):
+                    ...
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.failure_message = failure_message
+        self.exceptions = tuple(exceptions) + (asyncio.TimeoutError,)
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        # Bumped on every state change, results of calls started before it are ignored.
+        self._generation = 0
+
+    @property
+    def state(self) -> str:
+        """
+        The state of the circuit.
+
+        Returns:
+            :class:`str`:
+                ``'closed'``, ``'open'`` or ``'half-open'`` (when the next call is a trial call).
+        """
+        if self._opened_at is None:
+            return 'closed'
+        if self._trial_running or time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def reset(self):
+        """
+        Closes the circuit.
+        """
+        self.failures = 0
+        self._change_state(None)
+
+    def _change_state(self, opened_at, trial_running=False):
+        self._opened_at = opened_at
+        self._trial_running = trial_running
+        self._generation += 1
+
+    def _record_failure(self):
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self._change_state(time.monotonic())
+
+    async def call(self, func, *args, **kwargs):
+        """
+        |coro|
+
+        Calls ``func`` through this circuit breaker.
+
+        Returns:
+            The return value of ``func``.
+
+        Raises:
+            :class:`.CircuitOpenError`:
+                When the circuit is open.
+        """
+        state = self.state
+        if state == 'open' or (state == 'half-open' and self._trial_running):
+            raise CircuitOpenError("The circuit is open after {} failures.".format(self.failures))
+        if state == 'half-open':
+            self._change_state(self._opened_at, trial_running=True)
+        generation = self._generation
+
+        try:
+            if self.timeout is None:
+                result = await func(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(func(*args, **kwargs), self.timeout)
+        except asyncio.CancelledError:
+            if generation == self._generation:
+                self._trial_running = False
+            raise
+        except self.exceptions:
+            if generation == self._generation:
+                self._record_failure()
+            raise
+        except BaseException:
+            if generation == self._generation:
+                self._trial_running = False
+            raise
+
+        if generation == self._generation:
+            if self._opened_at is None:
+                self.failures = 0
+            else:
+                self.reset()
+        return result
+
+    def __call__(self, func):
+        @wraps(func)
+        async def guarded(*args, **kwargs):
+            try:
+                return await self.call(func, *args, **kwargs)
+            except CircuitOpenError:
+                ctx = _find_context(args)
+                if ctx is None or self.failure_message is None:
+                    raise
+                await ctx.send(self.failure_message)
+        return guarded
@@ -0,0 +1,199 @@
+from .exceptions import EasyDiscordError
+from collections import deque
+from functools import wraps
+
+import asyncio
+
+__all__ = ["Scheduler", "PRIORITIES"]
+
+# Ordered from the most to the least urgent.
+PRIORITIES = ('interactive', 'normal', 'background')
+
+
+class Scheduler:
+
+    def __init__(self, max_concurrency=None, *, lag_threshold=0.1, normal_lag_threshold=0.5, probe_interval=0.05,
+                 background_burst=10, max_deferred=1000):
+        """
+        Decides when command and event handlers may start, so that busy periods don't delay the urgent ones.
+        Every handler belongs to one of the lanes in :data:`PRIORITIES`.
+
+        The event loop's lag, how late a short sleep wakes up, is measured while handlers are being started.
+        A measurement that is already overdue counts as lag too, so a burst is noticed while it's still running.
+        When it exceeds ``lag_threshold`` the loop is saturated: ``'background'`` handlers are deferred,
+        leaving the loop to the other handlers, and are let through ``background_burst`` per measurement
+        once the lag drops. At most ``max_deferred`` of them wait, the oldest ones are dropped without running,
+        which suits events that replace each other such as presence updates.
+        When the lag exceeds ``normal_lag_threshold`` too, ``'normal'`` handlers are deferred as well
+        (never dropped), until the lag drops below it. ``'interactive'`` handlers are never deferred.
+        Unless ``max_concurrency`` is set, handlers don't hold anything once started.
+
+        ``max_concurrency`` additionally caps how many handlers run at the same time, the remaining ones
+        wait and are resumed most urgent lane first. Note that a handler keeps its slot until it returns,
+        including while it awaits (eg. a paginated reply waiting for reactions, or a slow backend),
+        so a low cap lets a few slow handlers hold up every other command and event.
+
+        Args:
+            max_concurrency: (:class:`int`):
+                How many handlers may run at the same time. Defaults to :const:`None`, unlimited.
+
+            lag_threshold: (:class:`float`):
+                The loop lag, in seconds, above which the loop counts as saturated. Defaults to ``0.1``.
+
+            normal_lag_threshold: (:class:`float`):
+                The loop lag, in seconds, above which ``'normal'`` handlers are deferred too. Defaults to ``0.5``.
+
+            probe_interval: (:class:`float`):
+                How often, in seconds, the loop lag is measured. Defaults to ``0.05``.
+
+            background_burst: (:class:`int`):
+                How many deferred ``'background'`` handlers are let through per measurement. Defaults to ``10``.
+
+            max_deferred: (:class:`int`):
+                How many ``'background'`` handlers may be deferred at once. Defaults to ``1000``.
+        """
+        self.max_concurrency = max_concurrency
+        self.lag_threshold = lag_threshold
+        self.normal_lag_threshold = normal_lag_threshold
+        self.probe_interval = probe_interval
+        self.background_burst = background_burst
+        self.max_deferred = max_deferred
+        self.lag = 0.0
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._waiting = {priority: deque() for priority in PRIORITIES}
+        self._probe_task = None
+        self._next_probe = None
+        self._last_used = None
+
+    @staticmethod
+    def check_priority(priority):
+        """
+        Raises:
+            :class:`.EasyDiscordError`:
+                When ``priority`` is not one of :data:`PRIORITIES`.
+        """
+        if priority not in PRIORITIES:
+            raise EasyDiscordError("priority must be one of {}, not {!r}".format(', '.join(PRIORITIES), priority))
+
+    def current_lag(self) -> float:
+        """
+        Returns the event loop's lag in seconds, the last measurement or how overdue the next one is.
+        """
+        if self._next_probe is None:
+            return self.lag
+        return max(self.lag, asyncio.get_event_loop().time() - self._next_probe)
+
+    @property
+    def saturated(self) -> bool:
+        """
+        Whether or not the event loop's lag is above ``lag_threshold``.
+
+        Returns:
+            :class:`bool`
+        """
+        return self.current_lag() >= self.lag_threshold
+
+    def _full(self):
+        return self.max_concurrency is not None and sum(self._running.values()) >= self.max_concurrency
+
+    def _can_run(self, priority):
+        if self._full():
+            return False
+        if any(self._waiting[p] for p in PRIORITIES[:PRIORITIES.index(priority)]):
+            return False
+        if priority == 'background':
+            return not self.saturated
+        return priority != 'normal' or self.current_lag() < self.normal_lag_threshold
+
+    def _wake(self, lanes=PRIORITIES):
+        for priority in lanes:
+            waiting = self._waiting[priority]
+            woken = 0
+            while waiting and self._can_run(priority):
+                if priority == 'background' and woken >= self.background_burst:
+                    break
+                future = waiting.popleft()
+                if future.done():
+                    continue
+                self._running[priority] += 1
+                future.set_result(True)
+                woken += 1
+            if waiting:
+                # Less urgent lanes never overtake a lane that is still waiting.
+                break
+
+    async def _probe(self):
+        loop = asyncio.get_event_loop()
+        while any(self._waiting.values()) or loop.time() - self._last_used < 5.0:
+            self._next_probe = loop.time() + self.probe_interval
+            await asyncio.sleep(self.probe_interval)
+            self.lag = max(0.0, loop.time() - self._next_probe)
+            self._next_probe = None
+            self._wake()
+        # Nothing was started for a while, the measurement would only get stale.
+        self.lag = 0.0
+
+    async def acquire(self, priority='normal'):
+        """
+        |coro|
+
+        Waits until a handler of the given ``priority`` may start.
+        Every call that returns :const:`True` must be followed by a call to :meth:`release`.
+
+        Returns:
+            :class:`bool`:
+                :const:`False` if the handler was dropped because too many were deferred, it must not run.
+        """
+        self.check_priority(priority)
+        self._last_used = asyncio.get_event_loop().time()
+        if self._probe_task is None or self._probe_task.done():
+            self._next_probe = self._last_used + self.probe_interval
+            self._probe_task = asyncio.ensure_future(self._probe())
+
+        if not self._waiting[priority] and self._can_run(priority):
+            self._running[priority] += 1
+            return True
+
+        future = asyncio.get_event_loop().create_future()
+        waiting = self._waiting[priority]
+        waiting.append(future)
+        if priority == 'background':
+            while len(waiting) > self.max_deferred:
+                dropped = waiting.popleft()
+                if not dropped.done():
+                    dropped.set_result(False)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.result():
+                self.release(priority)
+            elif future in self._waiting[priority]:
+                self._waiting[priority].remove(future)
+            raise
+
+    def release(self, priority='normal'):
+        """
+        Frees the slot taken by :meth:`acquire`.
+        """
+        self._running[priority] -= 1
+        # Deferred background handlers are only let through by the lag measurements.
+        self._wake(PRIORITIES[:-1])
+
+    def wrap(self, func, priority='normal'):
+        """
+        Wraps a coroutine function so that it only starts when the scheduler allows it.
+
+        Returns:
+            The wrapped coroutine function.
+        """
+        self.check_priority(priority)
+
+        @wraps(func)
+        async def scheduled(*args, **kwargs):
+            if not await self.acquire(priority):
+                return None
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.release(priority)
+        return scheduled
@@ -1,17 +1,10 @@
-from contextlib import contextmanager
+from collections import deque
+from collections.abc import Iterator
 import asyncio
 
 from .exceptions import *
 
 
-@contextmanager
-def _no_print(self):
-    _print = self.print
-    self.print = lambda *args, **kwargs: None
-    yield
-    self.print = _print
-
-
 def _check_coro(func, severity):
     if not asyncio.iscoroutinefunction(func):
         if severity == 'low':
@@ -22,3 +15,77 @@ def _check_coro(func, severity):
         else:
             raise NotImplementedError
     return func
+
+
+class _Paginator:
+    """
+    Lazily turns a (async) iterable of strings into pages no longer than ``limit`` characters.
+    Only one page worth of text is buffered at a time.
+    Sync iterators (eg. generators or files) may block, so they are read in the default executor,
+    a page worth of items at a time. Other iterables (eg. lists) are already in memory and read directly.
+    """
+
+    def __init__(self, source, limit=2000):
+        if hasattr(source, '__aiter__'):
+            self._source = source.__aiter__()
+            self._is_async = True
+        else:
+            self._blocking = isinstance(source, Iterator)
+            self._source = iter(source)
+            self._is_async = False
+        self.limit = limit
+        self._buffer = ''
+        self._pending = deque()
+        self.exhausted = False
+
+    def _read_items(self):
+        items, size = [], 0
+        for item in self._source:
+            item = str(item)
+            items.append(item)
+            size += len(item)
+            if size >= self.limit:
+                break
+        return items
+
+    async def _next_chunk(self):
+        if self._is_async:
+            try:
+                return str(await self._source.__anext__())
+            except StopAsyncIteration:
+                return None
+
+        if not self._pending:
+            if self._blocking:
+                self._pending.extend(await asyncio.get_event_loop().run_in_executor(None, self._read_items))
+            else:
+                self._pending.extend(self._read_items())
+        return self._pending.popleft() if self._pending else None
+
+    async def next_page(self):
+        """
+        Returns the next page, or :const:`None` when the source is exhausted.
+        """
+        while not self.exhausted and len(self._buffer) < self.limit:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                self.exhausted = True
+                break
+            if self._buffer and len(self._buffer) + len(chunk) > self.limit:
+                page, self._buffer = self._buffer, chunk
+                return page
+            self._buffer += chunk
+
+        if not self._buffer:
+            return None
+        page, self._buffer = self._buffer[:self.limit], self._buffer[self.limit:]
+        return page
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        page = await self.next_page()
+        if page is None:
+            raise StopAsyncIteration
+        return page